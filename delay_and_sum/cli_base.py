@@ -4,6 +4,8 @@ import numpy as np
 import sys
 import os
 
+from .signal_processing import SignalProcessor
+
 class CliHandler:
     """
     Base class for cli handler
@@ -20,7 +22,7 @@ class CliHandler:
         xmin = -max_ang
         xmax = max_ang + 1
         max_val = np.amax(rms_list)
-        src_angle = np.argmax(rms_list) - max_ang
+        src_angle = SignalProcessor().peak_index(rms_list) - max_ang
         ang_range = range(xmin, xmax, 1)
         plt.plot(ang_range, rms_list)
         plt.grid()
@@ -31,6 +33,14 @@ class CliHandler:
         plt.vlines(src_angle, 0, max_val, 'r', '--')
         plt.show()
 
+    def print_stats(self, num_angles, stats):
+        """
+        Print how much work the angle scan actually did
+        """
+        msg = "Scanned {} angles with {} distinct delay sets " \
+              "({} channel x direction evaluations)"
+        print(msg.format(num_angles, stats['directions'], stats['channel_directions']))
+
     def read_signals_from_wav(self, filename):
         """
         Safely read an audio signal from a .wav file.
@@ -1,4 +1,6 @@
 import numpy as np
+import os
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 
 from .signal_processing import SignalProcessor
@@ -7,6 +9,11 @@ from ._helper import TO_RAD
 from ._helper import TO_DEG
 from ._helper import PointSourceHelper
 
+# decimated bands keep a sampling rate of at least this multiple of their
+# upper edge, so whole-sample delays stay fine enough that the combined
+# curve has no plateaus wider than the ones of the full rate scan
+BAND_OVERSAMPLING = 32
+
 
 class DelayAndSum:
     """
@@ -34,6 +41,198 @@ class DelayAndSum:
         desc = "<{cls} Object with {nm} mics with distance of {dx}, fs: {fs}>"
         return desc
 
+    def plan_directions(self, delay_table):
+        """
+        Group steering directions that map to identical whole-sample delays.
+
+        delay_table: (A, N) - array with the rounded delays (in samples)
+                     of the N microphones for each of the A angles
+
+        returns: (U, N) - array with the U distinct delay vectors and
+                 (A) - array with the index of each angle's delay vector
+        """
+        unique_delays, inverse = np.unique(delay_table, axis=0,
+                                           return_inverse=True)
+        return unique_delays, inverse.reshape(-1)
+
+    def _rms_for_delay_table(self, signals, delay_table, window, workers=None):
+        """
+        Compute the rms value of the summed signals for each row of a delay
+        table, evaluating every distinct delay vector only once.
+
+        If more than one worker is requested, the distinct delay vectors are
+        split into chunks that are processed by a thread pool. The input
+        signals are shared between the threads and never modified. As each
+        thread holds one working copy of the signals, the number of threads
+        is limited to the number of CPUs (and of distinct delay vectors).
+
+        returns: (A) - array with the (linear) rms value for each angle
+                 and the evaluation statistics (see '_stats')
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("Number of workers must be at least one!")
+
+        if window:
+            signals = signals * self._sp.hann_window(signals.shape[1])
+
+        unique_delays, inverse = self.plan_directions(delay_table)
+        rms_values = np.empty(len(unique_delays))
+        if workers is not None:
+            workers = min(workers, len(unique_delays), os.cpu_count() or 1)
+
+        def evaluate(chunk):
+            for i in chunk:
+                signals_tmp = deepcopy(signals)
+                self._sp.delay_signals(signals_tmp, unique_delays[i])
+                rms_values[i] = self._sp.get_rms(signals_tmp.sum(1))
+
+        if workers is None or workers == 1:
+            evaluate(range(len(unique_delays)))
+        else:
+            chunks = np.array_split(np.arange(len(unique_delays)), workers)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # consume the results to re-raise errors from the workers
+                list(pool.map(evaluate, chunks))
+
+        return rms_values[inverse], self._stats(unique_delays)
+
+    def _rms_for_delay_table_batch(self, stack, lengths, delay_table, window):
+        """
+        Compute the rms values of the summed signals for each row of a delay
+        table for several stacked signals at once. The (shared) distinct
+        delay vectors are evaluated once for all signals.
+
+        stack: (C x L x N) - array with the zero padded signals
+        lengths: (C) - array with the original lengths of the signals,
+                 samples beyond them are not taken into account
+
+        returns: (C x A) - array with the (linear) rms values
+                 and the evaluation statistics (see '_stats')
+        """
+        if delay_table.max() > lengths.min():
+            # same limit as 'SignalProcessor.delay_signal' for single signals
+            raise ValueError("Delay must be 0 <= delay <= signalLength!")
+
+        if window:
+            stack = stack * self._sp.hann_window(stack.shape[2])
+
+        unique_delays, inverse = self.plan_directions(delay_table)
+        num_clips, length = stack.shape[:2]
+        # one contiguous (C x L) block per mic for fast shifted additions
+        mic_blocks = np.ascontiguousarray(stack.transpose(2, 0, 1))
+        valid = np.arange(length) < lengths[:, np.newaxis]
+        rms_values = np.empty((num_clips, len(unique_delays)))
+        summed = np.empty((num_clips, length))
+        for i, delays in enumerate(unique_delays):
+            summed.fill(0)
+            for block, d in zip(mic_blocks, delays.astype(int)):
+                summed[:, d:] += block[:, :length - d]
+            summed *= valid
+            rms_values[:, i] = np.sqrt(np.square(summed).sum(1) / lengths)
+
+        return rms_values[:, inverse], self._stats(unique_delays)
+
+    def _stats(self, unique_delays):
+        """
+        Summarise the work of a scan over the given distinct delay vectors.
+
+        returns: dict with the number of evaluated 'directions' and the
+                 number of 'channel_directions' (channels times directions)
+        """
+        num, channels = unique_delays.shape
+        return {'directions': num, 'channel_directions': num * channels}
+
+    def nested_strides(self):
+        """
+        Return the mic strides (1, 2, 4, ...) of the nested subarrays used
+        by the broadband mode. The coarsest subarray still has at least
+        four mics.
+        """
+        strides = [1]
+        while 2 * strides[-1] * 3 <= self.num_mics - 1:
+            strides.append(2 * strides[-1])
+        return strides
+
+    def subarray_stride(self, freq):
+        """
+        Compute the largest mic stride (every n-th microphone) for which
+        the spacing of the subarray still avoids spatial aliasing up to
+        the given frequency, limited to the coarsest nested stride.
+
+        freq: highest frequency the subarray has to handle in Hertz
+        """
+        max_stride = self.nested_strides()[-1]
+        if freq <= 0:
+            return max_stride
+        # small tolerance so band edges from 'default_band_edges' map exactly
+        stride = int(SPEED_OF_SOUND / (2 * freq * self.delta_x) + 1e-9)
+        return min(max(stride, 1), max_stride)
+
+    def subarray_mics(self, stride):
+        """
+        Return the indices of the microphones of the nested subarray for the
+        given stride. The subarray always spans the whole aperture: it keeps
+        the first and the last mic, is symmetric to the array centre and has
+        no gap larger than <stride> mic spacings. Stride one uses all mics.
+        """
+        last = self.num_mics - 1
+        num = int(np.ceil(last / stride)) + 1
+        if last % 2 and num % 2:
+            # the centre is no mic position, so use an even number of mics
+            num += 1
+        num = min(num, self.num_mics)
+
+        # round the left half and mirror it, so the subset stays symmetric
+        left = np.floor(np.arange(num // 2) * last / (num - 1) + 0.5).astype(int)
+        centre = [last // 2] if num % 2 else []
+        return np.concatenate([left, centre, last - left[::-1]]).astype(int)
+
+    def default_band_edges(self):
+        """
+        Compute band edges so that each band ends at the aliasing limit
+        of its nested subarray (see 'nested_strides').
+
+        returns: ascending list of band edges in Hertz from 0 to fs/2
+        """
+        edges = [SPEED_OF_SOUND / (2 * stride * self.delta_x)
+                 for stride in self.nested_strides()[1:]]
+        edges = sorted(f for f in edges if f < self.fs / 2.)
+        return [0.] + edges + [self.fs / 2.]
+
+    def _broadband_rms(self, signals, delay_table_for, band_edges, window, workers=None):
+        """
+        Split the signals into bands and steer each band with the nested
+        subarray suited to its upper edge: all subarrays span the whole
+        aperture, lower bands just use fewer mics. Bands below fs/2 are
+        decimated before steering. The band energies are added up.
+
+        delay_table_for: function that returns the delay table of the
+                         scanned angles for a given sampling rate
+
+        returns: (A) - array with the (linear) rms value for each angle
+                 and the evaluation statistics of all bands (see '_stats')
+        """
+        if band_edges is None:
+            band_edges = self.default_band_edges()
+
+        bands = self._sp.split_bands(signals, band_edges, self.fs)
+        power = 0.
+        stats = {'directions': 0, 'channel_directions': 0}
+        for band, hi in zip(bands, band_edges[1:]):
+            mics = self.subarray_mics(self.subarray_stride(hi))
+            # the band has no content above <hi>, so it can be decimated
+            factor = max(int(self.fs / (BAND_OVERSAMPLING * hi)), 1)
+            table = delay_table_for(self.fs / factor)[:, mics]
+            # only delay differences matter, so the earliest mic gets no delay
+            table = table - table.min(axis=1, keepdims=True)
+            rms_values, band_stats = self._rms_for_delay_table(band[::factor, mics],
+                                                               table, window, workers)
+            power = power + np.square(rms_values)
+            for key in stats:
+                stats[key] += band_stats[key]
+
+        return np.sqrt(power), stats
+
 
 class DelayAndSumPlane(DelayAndSum):
     """
@@ -68,7 +267,8 @@ class DelayAndSumPlane(DelayAndSum):
         return delta_t
 
     def make_rms_list(self, signals, start_angle=-90, stop_angle=90, angle_steps=1,
-                      window=False):
+                      window=False, workers=None, broadband=False, band_edges=None,
+                      return_stats=False):
         """
         Perform delay & sum algorithm for a given set of microphone signals
         to compute an array of rms values for given angles (default: -90 to 90)
@@ -80,6 +280,15 @@ class DelayAndSumPlane(DelayAndSum):
         stop_angle: compute up to this angle
         angle_steps: steps between angles
         window: boolean flag that indicates to use a window function
+        workers: number of threads to scan the angles with (at most the
+                 number of CPUs is used), if not given, scan serially
+        broadband: if True, steer each frequency band with a subset of
+                   the microphones suited to it and combine the band energies
+        band_edges: band edges in Hertz for the broadband mode,
+                    if not given, use 'default_band_edges'
+        return_stats: if True, also return a dict with the number of
+                      evaluated (distinct) 'directions' and of
+                      'channel_directions' (channels times directions)
 
         returns: list of rms values for the angles from <start_angle> to
                  <stop_angle> in <angle_steps>
@@ -94,19 +303,72 @@ class DelayAndSumPlane(DelayAndSum):
         if start_angle > stop_angle or stop_angle - start_angle < angle_steps:
             raise ValueError("Given angle range not valid")
 
-        w = self._sp.hann_window(signals.shape[1])
-        rms_values = []
+        angles = range(start_angle, stop_angle + 1, angle_steps)
+        if broadband:
+            delay_table_for = lambda fs: self.delay_table(angles, fs)
+            rms_values, stats = self._broadband_rms(signals, delay_table_for,
+                                                    band_edges, window, workers)
+        else:
+            rms_values, stats = self._rms_for_delay_table(signals, self.delay_table(angles),
+                                                          window, workers)
+        if return_stats:
+            return self._sp.to_db(rms_values), stats
+        return self._sp.to_db(rms_values)
+
+    def make_rms_lists(self, signals_list, start_angle=-90, stop_angle=90,
+                       angle_steps=1, window=False, return_stats=False):
+        """
+        Perform delay & sum algorithm for many recordings of the same array
+        at once. The recordings are zero padded to the same length and
+        processed in one stacked computation.
 
-        for angle in range(start_angle, stop_angle + 1, angle_steps):
-            signals_tmp = deepcopy(signals)
-            if window:
-                signals_tmp *= w
-            delay = self.delta_t_for_angle(angle, in_samples=True)
-            self._sp.delay_signals_with_baseDelay(signals_tmp, delay)
-            rms_values.append(self._sp.get_rms(signals_tmp.sum(1)))
+        signals_list: list of (L_i x N) numpy arrays with the microphone
+                      signals of each recording
+        start_angle: start at this angle
+        stop_angle: compute up to this angle
+        angle_steps: steps between angles
+        window: boolean flag that indicates to use a window function
+        return_stats: if True, also return a dict with the number of
+                      evaluated (distinct) 'directions' and of
+                      'channel_directions' (channels times directions)
+
+        returns: (C x A) - array with one list of rms values (as returned
+                 by 'make_rms_list') per recording
+        """
+        stack, lengths = self._sp.stack_signals(signals_list)
+        N = stack.shape[2]
 
+        if N != self.num_mics:
+            msg = "Number of given signals must equal the specified number of" \
+                  "microphones({}, given: {})"
+            raise ValueError(msg.format(self.num_mics, N))
+
+        if start_angle > stop_angle or stop_angle - start_angle < angle_steps:
+            raise ValueError("Given angle range not valid")
+
+        angles = range(start_angle, stop_angle + 1, angle_steps)
+        delay_table = self.delay_table(angles)
+        rms_values, stats = self._rms_for_delay_table_batch(stack, lengths,
+                                                            delay_table, window)
+        if return_stats:
+            return self._sp.to_db(rms_values), stats
         return self._sp.to_db(rms_values)
 
+    def delay_table(self, angles, fs=None):
+        """
+        Compute the whole-sample delays of all microphones for several angles
+
+        angles: iterable with the angles in degrees
+        fs: sampling rate the delays are counted in, if not given use self.fs
+
+        returns: (A, N) - array with the rounded delays in samples,
+                 one row per angle
+        """
+        fs = self.fs if fs is None else fs
+        return np.array([self._sp.base_delays(self.num_mics,
+                                              self.delta_t_for_angle(ang) * fs)
+                         for ang in angles])
+
 
 class DelayAndSumPointSources(DelayAndSum):
     """
@@ -134,7 +396,8 @@ class DelayAndSumPointSources(DelayAndSum):
         """
         return int(np.round(PointSourceHelper.max_angle(self.length, distance)))
 
-    def make_rms_list(self, signals, distance, window=False):
+    def make_rms_list(self, signals, distance, window=False, workers=None,
+                      broadband=False, band_edges=None, return_stats=False):
         """
         Compute RMS values for all valid positions on the sources
         positions plane.
@@ -144,6 +407,15 @@ class DelayAndSumPointSources(DelayAndSum):
                  length of the signals and N being the number of signals
         distance: distance to the source plane in meters
         window: boolean flag that indicates to use a window function
+        workers: number of threads to scan the angles with (at most the
+                 number of CPUs is used), if not given, scan serially
+        broadband: if True, steer each frequency band with a subset of
+                   the microphones suited to it and combine the band energies
+        band_edges: band edges in Hertz for the broadband mode,
+                    if not given, use 'default_band_edges'
+        return_stats: if True, also return a dict with the number of
+                      evaluated (distinct) 'directions' and of
+                      'channel_directions' (channels times directions)
 
         returns: list of rms values for the angles from <start_angle> to
                  <stop_angle> in <angle_steps>
@@ -161,18 +433,74 @@ class DelayAndSumPointSources(DelayAndSum):
 
         max_angle = self.max_angle(distance)
         angles = np.arange(-max_angle, max_angle + 1)
-        mic_positions = PointSourceHelper.mic_positions(self.length, self.delta_x)
+        if broadband:
+            delay_table_for = lambda fs: self.delay_table(angles, distance, fs)
+            rms_values, stats = self._broadband_rms(signals, delay_table_for,
+                                                    band_edges, window, workers)
+        else:
+            rms_values, stats = self._rms_for_delay_table(signals,
+                                                          self.delay_table(angles, distance),
+                                                          window, workers)
+        if return_stats:
+            return self._sp.to_db(rms_values), stats
+        return self._sp.to_db(rms_values)
 
-        rms_values = []
-        w = self._sp.hann_window(signals.shape[1])
-        for ang in angles:
-            src_pos = PointSourceHelper.src_position(ang, distance)
-            mic_delays = PointSourceHelper.mic_delays(mic_positions, src_pos, self.fs)
-            sigs_tmp = deepcopy(signals)
-            if window:
-                sigs_tmp *= w
-            for s, d in zip(sigs_tmp.T, mic_delays):
-                self._sp.delay_signal(s, np.round(d))
-            rms_values.append(self._sp.get_rms(sigs_tmp.sum(1)))
+    def make_rms_lists(self, signals_list, distance, window=False,
+                       return_stats=False):
+        """
+        Compute RMS values for all valid positions on the source plane
+        for many recordings of the same array at once. The recordings are
+        zero padded to the same length and processed in one stacked
+        computation.
 
+        signals_list: list of (L_i x N) numpy arrays with the microphone
+                      signals of each recording
+        distance: distance to the source plane in meters
+        window: boolean flag that indicates to use a window function
+        return_stats: if True, also return a dict with the number of
+                      evaluated (distinct) 'directions' and of
+                      'channel_directions' (channels times directions)
+
+        returns: (C x A) - array with one list of rms values (as returned
+                 by 'make_rms_list') per recording
+        """
+        stack, lengths = self._sp.stack_signals(signals_list)
+        N = stack.shape[2]
+
+        if N != self.num_mics:
+            msg = "Number of given signals must equal the specified number of" \
+            "microphones({}, given: {})"
+            raise ValueError(msg.format(self.num_mics, N))
+
+        if distance <= 0:
+            msg = "Distance to source plane must be bigger than zero!"
+            raise ValueError(msg)
+
+        max_angle = self.max_angle(distance)
+        angles = np.arange(-max_angle, max_angle + 1)
+        delay_table = self.delay_table(angles, distance)
+        rms_values, stats = self._rms_for_delay_table_batch(stack, lengths,
+                                                            delay_table, window)
+        if return_stats:
+            return self._sp.to_db(rms_values), stats
         return self._sp.to_db(rms_values)
+
+    def delay_table(self, angles, distance, fs=None):
+        """
+        Compute the whole-sample delays of all microphones for several
+        source positions on the source plane
+
+        angles: iterable with the angles in degrees
+        distance: distance to the source plane in meters
+        fs: sampling rate the delays are counted in, if not given use self.fs
+
+        returns: (A, N) - array with the rounded delays in samples,
+                 one row per angle
+        """
+        fs = self.fs if fs is None else fs
+        mic_positions = PointSourceHelper.mic_positions(self.length, self.delta_x)
+        table = []
+        for ang in angles:
+            src_pos = PointSourceHelper.src_position(ang, distance)
+            table.append(PointSourceHelper.mic_delays(mic_positions, src_pos, fs))
+        return np.round(np.array(table))
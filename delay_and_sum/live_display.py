@@ -0,0 +1,144 @@
+import matplotlib.pyplot as plt
+import numpy as np
+
+from ._helper import TO_RAD
+from .signal_processing import SignalProcessor
+
+# the automatic level range snaps to multiples of this value in dB
+LEVEL_STEP = 10.
+
+
+class LiveDisplay:
+    """
+    Persistent display for the directional function of a microphone array.
+
+    Keeps a single figure open and only redraws the rms curve, the peak
+    marker and the peak label (blitting), so a stream of rms lists can be
+    shown without rebuilding the whole canvas on every update.
+    """
+
+    def __init__(self, max_ang, ylim=(-60, 0), polar=False, autoscale=True):
+        """
+        Initialise new LiveDisplay object and open its figure.
+
+        max_ang: maximum absolute angle of the rms lists in degrees,
+                 rms lists are expected to cover -max_ang to max_ang in
+                 steps of one degree
+        ylim: (min, max) - tuple with the (initial) level range in dB
+        polar: if True, show the directional function in a polar plot
+        autoscale: if True, the level range follows each rms list (in steps
+                   of 'LEVEL_STEP' dB, so the background is rarely redrawn),
+                   otherwise it stays fixed at <ylim>
+        """
+        self.max_ang = max_ang
+        self.polar = polar
+        self.autoscale = autoscale
+        self._angles = np.arange(-max_ang, max_ang + 1)
+        self._ylim = list(ylim)
+        self._background = None
+        self._sp = SignalProcessor()
+
+        if polar:
+            self._fig, self._ax = plt.subplots(subplot_kw={'projection': 'polar'})
+            self._ax.set_theta_zero_location('N')
+            self._ax.set_theta_direction(-1)
+            self._ax.set_thetamin(-max_ang)
+            self._ax.set_thetamax(max_ang)
+            self._x = self._angles * TO_RAD
+        else:
+            self._fig, self._ax = plt.subplots()
+            self._ax.grid()
+            self._ax.set_xlabel(r"$\alpha / °$")
+            self._ax.set_ylabel(r"$R / dB$")
+            self._ax.set_xlim(-max_ang, max_ang + 1)
+            self._x = self._angles
+        self._set_level_limits()
+
+        empty = np.full(len(self._angles), np.nan)
+        self._line, = self._ax.plot(self._x, empty, animated=True)
+        self._marker, = self._ax.plot([np.nan, np.nan], self._ylim, 'r--',
+                                      animated=True)
+        self._label = self._ax.text(0.02, 1.02, "", transform=self._ax.transAxes,
+                                    animated=True)
+
+        self._fig.canvas.mpl_connect('draw_event', self._on_draw)
+        plt.show(block=False)
+        plt.pause(0.001)
+
+    @property
+    def figure(self):
+        return self._fig
+
+    def _level_limits(self, levels):
+        """
+        Compute the level range for the given (finite) levels, rounded
+        outwards to multiples of 'LEVEL_STEP'
+        """
+        lo = np.floor(np.amin(levels) / LEVEL_STEP) * LEVEL_STEP
+        hi = np.ceil(np.amax(levels) / LEVEL_STEP) * LEVEL_STEP
+        if hi == lo:
+            hi += LEVEL_STEP
+        return [float(lo), float(hi)]
+
+    def _set_level_limits(self):
+        if self.polar:
+            self._ax.set_rlim(*self._ylim)
+        else:
+            self._ax.set_ylim(*self._ylim)
+
+    def _on_draw(self, event):
+        """
+        Store the static parts of the figure after every full redraw
+        (e.g. after resizing the window)
+        """
+        self._background = self._fig.canvas.copy_from_bbox(self._fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in (self._line, self._marker, self._label):
+            self._ax.draw_artist(artist)
+
+    def update(self, rms_list):
+        """
+        Show a new directional function.
+
+        rms_list: rms values in dB for the angles -max_ang to max_ang
+        """
+        rms_list = np.asarray(rms_list, dtype=float)
+        if len(rms_list) != len(self._angles):
+            msg = "Expected {} rms values, given: {}"
+            raise ValueError(msg.format(len(self._angles), len(rms_list)))
+
+        self._line.set_ydata(rms_list)
+
+        # silent frames give -inf dB, which must not reach the axis limits
+        finite = np.isfinite(rms_list)
+        ylim = self._ylim
+        if finite.any():
+            peak = self._sp.peak_index(np.where(finite, rms_list, -np.inf))
+            self._marker.set_xdata([self._x[peak]] * 2)
+            self._label.set_text("Source found at: {}°".format(self._angles[peak]))
+            if self.autoscale:
+                ylim = self._level_limits(rms_list[finite])
+        else:
+            self._marker.set_xdata([np.nan, np.nan])
+            self._label.set_text("No signal")
+
+        canvas = self._fig.canvas
+        if self._background is None or ylim != self._ylim:
+            # axis limits change, so the static background has to be redrawn
+            self._ylim = ylim
+            self._set_level_limits()
+            self._marker.set_ydata(self._ylim)
+            canvas.draw()
+        else:
+            canvas.restore_region(self._background)
+            self._draw_animated()
+            canvas.blit(self._fig.bbox)
+        canvas.flush_events()
+
+    def close(self):
+        """
+        Close the figure of this display
+        """
+        plt.close(self._fig)
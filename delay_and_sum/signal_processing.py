@@ -33,6 +33,21 @@ class SignalProcessor:
         """
         return 20 * np.log10(val)
 
+    def peak_index(self, values):
+        """
+        Return the index of the maximum of the given values. If the maximum
+        is reached by a run of neighboured values (e.g. angles that share the
+        same whole-sample delays), the centre of that run is returned.
+
+        values: numpy array (1-dim)
+        """
+        values = np.asarray(values)
+        start = int(np.argmax(values))
+        stop = start
+        while stop + 1 < len(values) and values[stop + 1] == values[start]:
+            stop += 1
+        return (start + stop) // 2
+
     def delay_signal(self, signal, delay):
         """
         Delay the given signal IN PLACE (!).
@@ -64,15 +79,92 @@ class SignalProcessor:
                     will have a delay of (N-1)*base_delay (other way round
                     for negative base_delay)
         """
-        num_mics = signals.shape[1]
-        if base_delay > 0:
-            delay_for_mic = lambda n: num_mics - n
-        elif base_delay < 0:
-            delay_for_mic = lambda n: n - 1
+        delays = self.base_delays(signals.shape[1], base_delay)
+        self.delay_signals(signals, delays)
+
+    def base_delays(self, num_mics, base_delay):
+        """
+        Compute the whole-sample delays that 'delay_signals_with_baseDelay'
+        applies to each of the signals.
+
+        num_mics: number of signals
+        base_delay: delay between the microphones in samples
+
+        returns: (num_mics) - array with the (rounded) delays in samples
+        """
+        n = np.arange(num_mics)
+        if base_delay >= 0:
+            delays = (num_mics - 1 - n) * base_delay
         else:
-            # if delay is zero nothing has to be done
-            return
+            delays = n * -base_delay
+        return np.round(delays)
+
+    def delay_signals(self, signals, delays):
+        """
+        Delay each of the signals in an (N,m) array IN PLACE (!)
+        by its own whole-sample delay.
+
+        signals: numpy array with the signals stacked horizontally
+        delays: (m) - array with one delay in samples per signal
+        """
+        for s, d in zip(signals.T, delays):
+            self.delay_signal(s, d)
+
+    def split_bands(self, signals, band_edges, fs):
+        """
+        Split signals into frequency bands using ideal (FFT) band passes.
+
+        signals: numpy array with the signals stacked horizontally
+        band_edges: strictly ascending list of band edge frequencies in Hertz
+                    from 0 to fs/2, band i ranges from band_edges[i] to
+                    band_edges[i+1]
+        fs: sampling frequency
+
+        returns: list with one array of the signals' shape per band
+        """
+        edges = np.asarray(band_edges, dtype=float)
+        if len(edges) < 2 or np.any(np.diff(edges) <= 0):
+            raise ValueError("Band edges must be strictly ascending!")
+        if edges[0] != 0 or edges[-1] != fs / 2.:
+            raise ValueError("Band edges must range from 0 to fs/2!")
+
+        length = signals.shape[0]
+        spectrum = np.fft.rfft(signals, axis=0)
+        freqs = np.fft.rfftfreq(length, 1. / fs)
+        freqs = freqs.reshape((-1,) + (1,) * (signals.ndim - 1))
+
+        bands = []
+        for i, (lo, hi) in enumerate(zip(band_edges[:-1], band_edges[1:])):
+            mask = (freqs >= lo) & (freqs < hi)
+            if i == len(band_edges) - 2:
+                # last band includes its upper edge
+                mask |= freqs == hi
+            bands.append(np.fft.irfft(spectrum * mask, n=length, axis=0))
+        return bands
+
+    def stack_signals(self, signals_list):
+        """
+        Stack several multichannel signals with the same channel count
+        into one array, padding shorter signals with zeros at the end.
+
+        signals_list: list of (L_i x N) numpy arrays
+
+        returns: (C x L x N) - array with the C stacked signals, L being the
+                 length of the longest signal, and (C) - array with the
+                 original signal lengths
+        """
+        if len(signals_list) == 0:
+            raise ValueError("No signals given!")
+
+        lengths = np.array([len(sig) for sig in signals_list])
+        if lengths.min() == 0:
+            raise ValueError("Signals must not be empty!")
+
+        channels = {sig.shape[1] for sig in signals_list}
+        if len(channels) != 1:
+            raise ValueError("All signals must have the same number of channels!")
 
-        for n in range(1, num_mics + 1):
-            delay = np.round(delay_for_mic(n) * base_delay)
-            self.delay_signal(signals[:,n - 1], np.abs(delay))
+        stack = np.zeros((len(signals_list), lengths.max(), channels.pop()))
+        for c, sig in enumerate(signals_list):
+            stack[c, :len(sig)] = sig
+        return stack, lengths
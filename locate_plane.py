@@ -19,11 +19,13 @@ class CliPlaneHandler(CliHandler):
     def __init__(self):
         self._max_angle = 90
 
-    def main(self, filename, num_mics, arr_len, use_win):
+    def main(self, filename, num_mics, arr_len, use_win, workers=None, broadband=False):
         dx = arr_len / (num_mics - 1)
         s, fs = self.read_signals_from_wav(filename)
         das = DelayAndSumPlane(dx, num_mics, fs)
-        rms_list = das.make_rms_list(s, window = use_win)
+        rms_list, stats = das.make_rms_list(s, window = use_win, workers = workers,
+                                            broadband = broadband, return_stats = True)
+        self.print_stats(len(rms_list), stats)
         self.plot_results(self._max_angle, rms_list)
 
 
@@ -37,6 +39,11 @@ if __name__ == '__main__':
                         help="Length of the microphone array in meters")
     parser.add_argument("-w", "--window", action="store_true",
                         help="Use Hann-Window for microphone weights")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Number of threads to scan the angles with")
+    parser.add_argument("-b", "--broadband", action="store_true",
+                        help="Steer each frequency band with a suitably spaced subarray")
     args = parser.parse_args()
     handler = CliPlaneHandler()
-    handler.main(args.file, args.numMics, args.arrayLength, args.window)
+    handler.main(args.file, args.numMics, args.arrayLength, args.window, args.workers,
+                 args.broadband)
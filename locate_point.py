@@ -19,12 +19,15 @@ class CliPointHandler(CliHandler):
     def __init__(self):
         self._max_angle = None
 
-    def main(self, filename, num_mics, arr_len, dist, use_win):
+    def main(self, filename, num_mics, arr_len, dist, use_win, workers=None,
+             broadband=False):
         dx = arr_len / (num_mics - 1)
         s, fs = self.read_signals_from_wav(filename)
         das = DelayAndSumPointSources(dx, num_mics, fs)
         self._max_angle = das.max_angle(dist)
-        rms_list = das.make_rms_list(s, dist, use_win)
+        rms_list, stats = das.make_rms_list(s, dist, use_win, workers, broadband,
+                                            return_stats=True)
+        self.print_stats(len(rms_list), stats)
         self.plot_results(self._max_angle, rms_list)
 
 
@@ -40,6 +43,11 @@ if __name__ == '__main__':
                         help="Distance to the source plane")
     parser.add_argument("-w", "--window", action="store_true",
                         help="Use Hann-Window for microphone weights")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Number of threads to scan the angles with")
+    parser.add_argument("-b", "--broadband", action="store_true",
+                        help="Steer each frequency band with a suitably spaced subarray")
     args = parser.parse_args()
     handler = CliPointHandler()
-    handler.main(args.file, args.numMics, args.arrayLength, args.distance, args.window)
+    handler.main(args.file, args.numMics, args.arrayLength, args.distance, args.window,
+                 args.workers, args.broadband)
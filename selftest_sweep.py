@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+"""
+Self test of the delay and sum algorithm: generate sine or noise test
+signals for a sweep of array configurations, locate them again and report the
+angular error together with runtime and throughput.
+"""
+
+import argparse
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from delay_and_sum import DelayAndSumPlane, DelayAndSumPointSources
+from delay_and_sum import TestsignalGenerator
+
+
+def run_config(config):
+    """
+    Generate the test signal for one configuration and locate it.
+
+    config: dict with the keys 'model' ('plane' or 'point'), 'angle',
+            'distance', 'num_mics', 'array_len', 'window', 'source',
+            'freq', 'length', 'fs', 'workers' and 'broadband'
+
+    returns: dict with the configuration, the found angle, the angular
+             error, the runtime in seconds, the number of scanned angles
+             per second and, if the scan used threads, whether its result
+             equals the serial scan
+    """
+    tg = TestsignalGenerator()
+    fs = config['fs']
+    num_mics = config['num_mics']
+    dx = config['array_len'] / (num_mics - 1)
+    if config['source'] == 'noise':
+        s = np.random.RandomState(0).randn(config['length'], 1)
+    else:
+        s = tg.create_sine(config['freq'], config['length'], fs)
+
+    if config['model'] == 'plane':
+        das = DelayAndSumPlane(dx, num_mics, fs)
+        dt = das.delta_t_for_angle(config['angle'], in_samples=True)
+        signals = tg.plane_wave_testsignals(num_mics, dt, s)
+        max_ang = 90
+        scan = lambda workers: das.make_rms_list(signals, window=config['window'],
+                                                 workers=workers,
+                                                 broadband=config['broadband'])
+    else:
+        das = DelayAndSumPointSources(dx, num_mics, fs)
+        signals = tg.point_source_testsignal(config['angle'], config['distance'],
+                                             das, s)
+        max_ang = das.max_angle(config['distance'])
+        scan = lambda workers: das.make_rms_list(signals, config['distance'],
+                                                 config['window'], workers,
+                                                 config['broadband'])
+    start = time.perf_counter()
+    rms_list = scan(config['workers'])
+    runtime = time.perf_counter() - start
+
+    matches_serial = None
+    if config['workers'] is not None:
+        matches_serial = np.array_equal(rms_list, scan(None))
+
+    found = das._sp.peak_index(rms_list) - max_ang
+    result = dict(config)
+    result.update(found=found,
+                  error=abs(found - config['angle']),
+                  runtime=runtime,
+                  throughput=len(rms_list) / runtime,
+                  matches_serial=matches_serial)
+    return result
+
+
+def make_configs(angles, distances, mic_counts, array_len, source, freq, length, fs,
+                 scan_workers=None, broadband=False):
+    """
+    Build the list of configurations to test. Point source configurations
+    with angles the array can not detect at the given distance are skipped.
+    """
+    configs = []
+    for num_mics, window, angle in itertools.product(mic_counts, (False, True), angles):
+        base = dict(angle=angle, num_mics=num_mics, array_len=array_len,
+                    window=window, source=source, freq=freq, length=length, fs=fs,
+                    workers=scan_workers, broadband=broadband)
+        configs.append(dict(base, model='plane', distance=None))
+        for dist in distances:
+            dx = array_len / (num_mics - 1)
+            das = DelayAndSumPointSources(dx, num_mics, fs)
+            if abs(angle) <= das.max_angle(dist):
+                configs.append(dict(base, model='point', distance=dist))
+    return configs
+
+
+def print_report(results):
+    header = "{:<6} {:>5} {:>6} {:>4} {:>6} {:>6} {:>6} {:>10} {:>10} {:>7}"
+    row = "{:<6} {:>5} {:>6} {:>4} {:>6} {:>6} {:>6} {:>10.4f} {:>10.1f} {:>7}"
+    serial = {None: "-", True: "ok", False: "DIFF"}
+    print(header.format("model", "mics", "dist", "win", "angle", "found",
+                        "error", "time / s", "dirs / s", "serial"))
+    for r in results:
+        dist = "-" if r['distance'] is None else r['distance']
+        print(row.format(r['model'], r['num_mics'], dist, "y" if r['window'] else "n",
+                         r['angle'], r['found'], r['error'], r['runtime'],
+                         r['throughput'], serial[r['matches_serial']]))
+
+    print()
+    summary = "{:<6} win={}: mean error {:.2f}°, max error {}°, mean time {:.4f} s"
+    for model, window in itertools.product(('plane', 'point'), (False, True)):
+        sel = [r for r in results if r['model'] == model and r['window'] == window]
+        if not sel:
+            continue
+        errors = [r['error'] for r in sel]
+        times = [r['runtime'] for r in sel]
+        print(summary.format(model, "y" if window else "n", np.mean(errors),
+                             max(errors), np.mean(times)))
+
+    mismatches = [r for r in results if r['matches_serial'] is False]
+    if any(r['matches_serial'] is not None for r in results):
+        print("{} threaded scans differ from the serial scan".format(len(mismatches)))
+
+
+def main(angles, distances, mic_counts, array_len, source, freq, length, fs, processes,
+         scan_workers=None, broadband=False):
+    configs = make_configs(angles, distances, mic_counts, array_len, source, freq,
+                           length, fs, scan_workers, broadband)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = list(pool.map(run_config, configs))
+    total = time.perf_counter() - start
+
+    print_report(results)
+    print("{} configurations in {:.2f} s ({:.1f} configurations / s)".format(
+        len(results), total, len(results) / total))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-a", "--angles", type=int, nargs="+",
+                        default=[-60, -30, -10, 0, 10, 30, 60],
+                        help="Source angles in degrees")
+    parser.add_argument("-d", "--distances", type=float, nargs="+",
+                        default=[1., 3.],
+                        help="Distances to the source plane in meters (point sources)")
+    parser.add_argument("-m", "--mics", type=int, nargs="+", default=[4, 8, 16],
+                        help="Numbers of microphones of the array")
+    parser.add_argument("-l", "--arrayLength", type=float, default=1.,
+                        help="Length of the microphone array in meters")
+    parser.add_argument("-s", "--source", choices=["sine", "noise"], default="sine",
+                        help="Source signal: sine (see --freq) or white noise")
+    parser.add_argument("-f", "--freq", type=float, default=1000.,
+                        help="Frequency of the test sine in Hertz")
+    parser.add_argument("-n", "--length", type=int, default=4800,
+                        help="Length of the test signals in samples")
+    parser.add_argument("--fs", type=int, default=48000,
+                        help="Sampling rate in Hertz")
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help="Number of worker processes (default: number of CPUs)")
+    parser.add_argument("-j", "--scanWorkers", type=int, default=None,
+                        help="Number of threads per angle scan, "
+                             "results are compared against the serial scan")
+    parser.add_argument("-b", "--broadband", action="store_true",
+                        help="Locate with the broadband (nested subarray) mode")
+    args = parser.parse_args()
+    main(args.angles, args.distances, args.mics, args.arrayLength, args.source, args.freq,
+         args.length, args.fs, args.processes, args.scanWorkers, args.broadband)